@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, List, Optional
 import numpy as np
+from model_registry import ModelRegistry, default_registry
 
 @dataclass
 class Detection:
@@ -18,10 +19,37 @@ class ProcessingResult:
     detections: List[Detection]
 
 class BaseProcessor(ABC):
-    def __init__(self, model_path: Optional[str] = None, confidence: float = 0.5, **kwargs):
+    def __init__(self, model_path: Optional[str] = None, confidence: float = 0.5,
+                 registry: Optional[ModelRegistry] = None, **kwargs):
         self.model_path = model_path
         self.confidence = confidence
         self.kwargs = kwargs
+        self.registry = registry or default_registry
+        self.model_key = None
+        if model_path:
+            # Only register the model here; it is loaded on first access
+            self.model_key = self.registry.acquire(model_path, type(self).load_model, kwargs)
+
+    @classmethod
+    def load_model(cls, model_path: str, **params) -> Any:
+        """Load the model at model_path.
+
+        Subclasses backed by a real model override this. It is called once
+        per (model_path, params) by the registry and the result is shared.
+        """
+        return None
+
+    @property
+    def model(self) -> Any:
+        if self.model_key is None:
+            return None
+        return self.registry.get(self.model_key)
+
+    def close(self) -> None:
+        """Release this processor's reference to its shared model."""
+        if self.model_key is not None:
+            self.registry.release(self.model_key)
+            self.model_key = None
 
     @abstractmethod
     def process(self, frame: np.ndarray, frame_id: int, timestamp: float) -> ProcessingResult:
@@ -1,20 +1,34 @@
 import asyncio
+import os
 import cv2
 import numpy as np
-from typing import AsyncIterator, Dict
+from typing import AsyncIterator, Dict, Optional
 from pipeline_dsl import Pipeline, ProcessingType
 from urllib.parse import urlparse, quote
 import logging
 from rss_service import RSSFeedService
+from stream_replay import FRAMES_FILE, FrameRecorder, ReplayCapture
 from datetime import datetime, timezone
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class Executor:
-    def __init__(self, pipeline: Pipeline):
+    def __init__(self, pipeline: Pipeline, record_path: Optional[str] = None,
+                 replay_path: Optional[str] = None, replay_realtime: bool = False,
+                 overwrite_recording: bool = False):
+        if record_path and replay_path and \
+                os.path.realpath(record_path) == os.path.realpath(replay_path):
+            raise ValueError("Cannot record into the recording being replayed")
+        if record_path and not overwrite_recording and \
+                os.path.exists(os.path.join(record_path, FRAMES_FILE)):
+            raise FileExistsError(f"Recording already exists: {record_path}")
         self.pipeline = pipeline
         self.running = False
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.replay_realtime = replay_realtime
+        self.overwrite_recording = overwrite_recording
         self.rss_service = RSSFeedService(pipeline.output)
 
     async def start(self):
@@ -51,8 +65,15 @@ class Executor:
             
         return auth_url
 
-    async def _process_stream(self) -> AsyncIterator[Dict]:
-        """Process RTSP stream and yield frames."""
+    def _open_capture(self):
+        """Open the RTSP source, or the recording when replaying."""
+        if self.replay_path:
+            logger.info(f"Replaying recorded stream from {self.replay_path}")
+            cap = ReplayCapture(self.replay_path, realtime=self.replay_realtime)
+            if not cap.isOpened():
+                raise ConnectionError(f"Recording is empty: {self.replay_path}")
+            return cap
+
         # Build authenticated RTSP URL
         rtsp_url = self._build_rtsp_url(self.pipeline.source)
         logger.info(f"Connecting to RTSP stream...")
@@ -63,29 +84,63 @@ class Executor:
             raise ConnectionError(f"Failed to connect to RTSP stream")
 
         logger.info("Successfully connected to RTSP stream")
+        return cap
+
+    async def _process_stream(self) -> AsyncIterator[Dict]:
+        """Process RTSP stream and yield frames."""
+        recorder = FrameRecorder(self.record_path, overwrite=self.overwrite_recording) \
+            if self.record_path else None
+        try:
+            cap = self._open_capture()
+        except Exception:
+            if recorder:
+                recorder.close()
+            raise
+        replaying = isinstance(cap, ReplayCapture)
         
         try:
             while self.running:
+                if replaying:
+                    # Pace realtime replay without blocking the event loop
+                    await asyncio.sleep(cap.next_delay())
                 ret, frame = cap.read()
                 if not ret:
+                    if replaying and cap.finished:
+                        logger.info("Reached end of recording")
+                        break
                     logger.warning("Failed to read frame, retrying...")
                     await asyncio.sleep(1)
                     continue
 
+                # Replayed frames keep their recorded time so runs are reproducible
+                timestamp = cap.timestamp if replaying else datetime.now(timezone.utc).timestamp()
+                if recorder:
+                    try:
+                        recorder.write(frame, timestamp)
+                    except ValueError as e:
+                        # Recording is a side feature; keep processing the stream
+                        logger.error(f"Stopping recording: {e}")
+                        recorder.close()
+                        recorder = None
+
                 # Process frame
-                processed_frame = await self._process_frame(frame)
+                processed_frame = await self._process_frame(frame, timestamp)
                 yield processed_frame
                 
-                # Control frame rate
-                await asyncio.sleep(1/30)  # 30 fps
+                # Control frame rate; replay is paced by its recorded timestamps
+                await asyncio.sleep(0 if replaying else 1/30)  # 30 fps
         finally:
             cap.release()
+            if recorder:
+                recorder.close()
             logger.info("Released RTSP stream")
 
-    async def _process_frame(self, frame: np.ndarray) -> Dict:
+    async def _process_frame(self, frame: np.ndarray, timestamp: Optional[float] = None) -> Dict:
         """Process a single frame according to pipeline steps."""
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc).timestamp()
         results = {
-            'timestamp': datetime.now(timezone.utc).timestamp(),
+            'timestamp': timestamp,
             'frame_size': frame.shape,
             'frame': frame  # Store original frame for saving
         }
@@ -97,8 +152,8 @@ class Executor:
         mean_brightness = np.mean(gray)
         results['brightness'] = mean_brightness
         
-        # Add motion detection
-        if hasattr(self, 'last_frame'):
+        # Add motion detection; skip the diff when the stream changed resolution
+        if hasattr(self, 'last_frame') and self.last_frame.shape == gray.shape:
             diff = cv2.absdiff(self.last_frame, gray)
             motion = np.mean(diff) > 25
             results['motion_detected'] = motion
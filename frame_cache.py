@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from base_processor import ProcessingResult
+
+SAMPLES_PER_BLOCK = 16
+
+
+def frame_signature(frame: np.ndarray, grid: Tuple[int, int] = (16, 16),
+                    roi: Optional[Sequence[int]] = None) -> np.ndarray:
+    """Compute a cheap perceptual signature of a frame.
+
+    Args:
+        frame: Input frame as numpy array (grayscale or multi-channel)
+        grid: Number of (rows, cols) blocks to average over
+        roi: Optional (x, y, width, height) region to restrict the signature to
+
+    Returns:
+        Flat float32 vector of block mean intensities in the 0-255 range
+
+    Raises:
+        ValueError: If the ROI does not overlap the frame
+    """
+    if roi is not None:
+        x, y, w, h = (int(v) for v in roi)
+        # Clip to the frame so a partly outside ROI covers only visible pixels
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, frame.shape[1]), min(y + h, frame.shape[0])
+        if w <= 0 or h <= 0 or x1 <= x0 or y1 <= y0:
+            raise ValueError(f"ROI {tuple(roi)} does not overlap frame of size "
+                             f"{frame.shape[1]}x{frame.shape[0]}")
+        frame = frame[y0:y1, x0:x1]
+    if frame.ndim == 2:
+        frame = frame[:, :, np.newaxis]
+
+    rows = max(1, min(grid[0], frame.shape[0]))
+    cols = max(1, min(grid[1], frame.shape[1]))
+    bh, bw = frame.shape[0] // rows, frame.shape[1] // cols
+    blocks = frame[:bh * rows, :bw * cols].reshape(rows, bh, cols, bw, -1)
+    # Subsample inside each block before reducing so large frames stay cheap
+    step_y = max(1, bh // SAMPLES_PER_BLOCK)
+    step_x = max(1, bw // SAMPLES_PER_BLOCK)
+    return blocks[:, ::step_y, :, ::step_x].mean(axis=(1, 3, 4), dtype=np.float32).ravel()
+
+
+def _copy_result(result: ProcessingResult, **changes) -> ProcessingResult:
+    # Results handed out must not share detections with the cached one
+    detections = [replace(d) for d in result.detections]
+    return replace(result, detections=detections, **changes)
+
+
+class ResultCache:
+    """Bounded LRU of processing results keyed by frame signature.
+
+    Raises ValueError for an ROI that is not four integers with positive
+    width and height. A lookup hits when a cached signature is within ``tolerance`` (mean
+    absolute difference in intensity levels) of the new one; the cached
+    result is returned with the new frame_id and timestamp.
+    """
+
+    def __init__(self, tolerance: float = 2.0, max_size: int = 16,
+                 grid: Tuple[int, int] = (16, 16), roi: Optional[Sequence[int]] = None):
+        if roi is not None:
+            if len(roi) != 4 or not all(isinstance(v, int) and not isinstance(v, bool) for v in roi):
+                raise ValueError(f"ROI must be [x, y, width, height] integers, got {roi!r}")
+            if roi[2] <= 0 or roi[3] <= 0:
+                raise ValueError(f"ROI width and height must be positive, got {roi!r}")
+        self.tolerance = tolerance
+        self.max_size = max_size
+        self.grid = tuple(grid)
+        self.roi = tuple(roi) if roi is not None else None
+        # Set once the ROI has been reported as outside the frame
+        self.roi_warned = False
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, ProcessingResult]]" = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def signature(self, frame: np.ndarray) -> np.ndarray:
+        return frame_signature(frame, self.grid, self.roi)
+
+    def lookup(self, signature: np.ndarray, frame_id: int, timestamp: float) -> Optional[ProcessingResult]:
+        # Most recently used entries first; static scenes match the newest one
+        for entry_id in reversed(self._entries):
+            cached_signature, result = self._entries[entry_id]
+            if cached_signature.shape != signature.shape:
+                continue
+            if float(np.abs(cached_signature - signature).mean()) <= self.tolerance:
+                self._entries.move_to_end(entry_id)
+                self.hits += 1
+                return _copy_result(result, frame_id=frame_id, timestamp=timestamp)
+        self.misses += 1
+        return None
+
+    def store(self, signature: np.ndarray, result: ProcessingResult) -> None:
+        self._entries[self._next_id] = (signature, _copy_result(result))
+        self._next_id += 1
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'size': len(self._entries),
+        }
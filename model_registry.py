@@ -0,0 +1,191 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ModelLoader = Callable[..., Any]
+ModelKey = Tuple[str, Hashable, ModelLoader]
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn nested params (dicts/lists from YAML) into a hashable key part."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def make_model_key(model_path: str, loader: ModelLoader, params: Optional[Dict] = None) -> ModelKey:
+    # The loader is part of the key so processors that load the same weights
+    # differently never receive each other's model
+    return (model_path, _freeze(params or {}), loader)
+
+
+def estimate_model_size(model: Any, model_path: str) -> int:
+    """Best-effort size of a loaded model in bytes.
+
+    Uses ``nbytes`` when the model exposes it (numpy-like weights), then the
+    size of the weights file on disk, and falls back to ``sys.getsizeof``.
+    """
+    nbytes = getattr(model, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if model_path and os.path.isfile(model_path):
+        return os.path.getsize(model_path)
+    return sys.getsizeof(model)
+
+
+@dataclass
+class _ModelEntry:
+    model_path: str
+    params: Dict
+    loader: ModelLoader
+    refcount: int = 0
+    model: Any = None
+    loaded: bool = False
+    size: int = 0
+    last_used: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    """Process-wide cache of models shared between processors and pipelines.
+
+    Models are keyed by path, params and loader, loaded lazily on first
+    ``get`` and reference counted through ``acquire``/``release``. Models
+    no longer referenced by any processor stay loaded as idle entries and
+    are evicted least-recently-used first once the loaded total exceeds
+    ``memory_budget``.
+    """
+
+    def __init__(self, memory_budget: Optional[int] = None,
+                 size_estimator: Callable[[Any, str], int] = estimate_model_size):
+        self.memory_budget = memory_budget
+        self.size_estimator = size_estimator
+        self._entries: "OrderedDict[ModelKey, _ModelEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def acquire(self, model_path: str, loader: ModelLoader, params: Optional[Dict] = None) -> ModelKey:
+        """Register interest in a model without loading it.
+
+        Args:
+            model_path: Path to the model weights
+            loader: Called as ``loader(model_path, **params)`` on first use
+            params: Parameters that distinguish model instances
+
+        Returns:
+            Key to pass to ``get`` and ``release``
+        """
+        key = make_model_key(model_path, loader, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _ModelEntry(model_path=model_path, params=dict(params or {}), loader=loader)
+                self._entries[key] = entry
+            entry.refcount += 1
+        return key
+
+    def release(self, key: ModelKey) -> None:
+        """Drop one reference; unreferenced models become idle and evictable."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount == 0:
+                raise KeyError(f"Model is not acquired: {key[0]}")
+            entry.refcount -= 1
+            if entry.refcount == 0 and not entry.loaded:
+                del self._entries[key]
+            else:
+                self._evict()
+
+    def get(self, key: ModelKey) -> Any:
+        """Return the model for ``key``, loading it on first use."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(f"Model is not acquired: {key[0]}")
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(key)
+            if entry.loaded:
+                return entry.model
+
+        # Load outside the registry lock so other models stay available
+        with entry.lock:
+            if not entry.loaded:
+                logger.info(f"Loading model {entry.model_path}")
+                model = entry.loader(entry.model_path, **entry.params)
+                with self._lock:
+                    if self._entries.get(key) is not entry:
+                        # Released while loading; don't cache an unreferenced model
+                        return model
+                    entry.model = model
+                    entry.size = self.size_estimator(model, entry.model_path)
+                    entry.loaded = True
+                    self._evict()
+            return entry.model
+
+    def warmup(self, keys: Iterable[ModelKey]) -> threading.Thread:
+        """Load the given models on a background thread."""
+        keys = list(keys)
+
+        def _run():
+            for key in keys:
+                try:
+                    self.get(key)
+                except KeyError:
+                    continue
+                except Exception as e:
+                    logger.error(f"Failed to warm up model {key[0]}: {e}")
+
+        thread = threading.Thread(target=_run, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def is_loaded(self, key: ModelKey) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.loaded
+
+    def refcount(self, key: ModelKey) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.refcount if entry else 0
+
+    @property
+    def loaded_size(self) -> int:
+        with self._lock:
+            return sum(e.size for e in self._entries.values() if e.loaded)
+
+    def loaded_keys(self) -> List[ModelKey]:
+        with self._lock:
+            return [k for k, e in self._entries.items() if e.loaded]
+
+    def clear(self) -> None:
+        """Forget every model, referenced or not."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        # Caller holds self._lock; entries are kept in LRU order
+        if self.memory_budget is None:
+            return
+        total = sum(e.size for e in self._entries.values() if e.loaded)
+        for key in list(self._entries):
+            if total <= self.memory_budget:
+                break
+            entry = self._entries[key]
+            if entry.refcount == 0 and entry.loaded:
+                logger.info(f"Evicting idle model {entry.model_path}")
+                total -= entry.size
+                del self._entries[key]
+        if total > self.memory_budget:
+            logger.warning(f"Loaded models use {total} bytes, above budget of {self.memory_budget} bytes")
+
+
+default_registry = ModelRegistry()
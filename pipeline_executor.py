@@ -1,36 +1,88 @@
 import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import numpy as np
 from processing_types import ProcessingType
 from processor_factory import ProcessorFactory
 from base_processor import BaseProcessor, ProcessingResult
+from model_registry import ModelRegistry, default_registry
+from frame_cache import ResultCache
 
 class PipelineExecutor:
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], registry: Optional[ModelRegistry] = None):
         self.config = config
+        self.registry = registry or default_registry
         self.name = config['pipeline']['name']
         self.source = config['pipeline']['source']
         self.output_config = config['pipeline']['output']
         self.processors = self._initialize_processors()
+        self.caches = self._initialize_caches()
         self.results_queue = asyncio.Queue()
+        if config['pipeline'].get('warmup_models', False):
+            self.warmup_models()
 
     def _initialize_processors(self) -> List[BaseProcessor]:
         processors = []
-        for proc_config in self.config['pipeline']['processing']:
-            processor = ProcessorFactory.create(
-                processing_type=ProcessingType(proc_config['type']),
-                model_path=proc_config.get('model_path'),
-                confidence=proc_config.get('confidence', 0.5),
-                **proc_config.get('params', {})
-            )
-            processors.append(processor)
+        try:
+            for proc_config in self.config['pipeline']['processing']:
+                processor = ProcessorFactory.create(
+                    processing_type=ProcessingType(proc_config['type']),
+                    model_path=proc_config.get('model_path'),
+                    confidence=proc_config.get('confidence', 0.5),
+                    registry=self.registry,
+                    **proc_config.get('params', {})
+                )
+                processors.append(processor)
+        except Exception:
+            # Don't leave models acquired by the steps built so far
+            for processor in processors:
+                processor.close()
+            raise
         return processors
 
+    def _initialize_caches(self) -> List[Optional[ResultCache]]:
+        caches = []
+        for proc_config in self.config['pipeline']['processing']:
+            cache_config = proc_config.get('cache')
+            if cache_config is None or cache_config is False:
+                caches.append(None)
+                continue
+            if cache_config is True:
+                cache_config = {}
+            caches.append(ResultCache(
+                tolerance=cache_config.get('tolerance', 2.0),
+                max_size=cache_config.get('max_size', 16),
+                grid=cache_config.get('grid', (16, 16)),
+                roi=cache_config.get('roi')
+            ))
+        return caches
+
     async def process_frame(self, frame: np.ndarray, frame_id: int, timestamp: float) -> List[ProcessingResult]:
         results = []
-        for processor in self.processors:
+        # Steps sharing the same grid and ROI reuse one signature per frame
+        signatures = {}
+        for processor, cache in zip(self.processors, self.caches):
             try:
+                signature = None
+                if cache is not None:
+                    signature_key = (cache.grid, cache.roi)
+                    if signature_key not in signatures:
+                        try:
+                            signatures[signature_key] = cache.signature(frame)
+                        except ValueError as e:
+                            signatures[signature_key] = e
+                    signature = signatures[signature_key]
+                    if isinstance(signature, ValueError):
+                        if not cache.roi_warned:
+                            logging.warning(f"Bypassing result cache for {processor.__class__.__name__}: {signature}")
+                            cache.roi_warned = True
+                        signature = None
+                if signature is not None:
+                    result = cache.lookup(signature, frame_id, timestamp)
+                    if result is not None:
+                        results.append(result)
+                        continue
+
                 result = await asyncio.get_event_loop().run_in_executor(
                     None,
                     processor.process,
@@ -38,11 +90,37 @@ class PipelineExecutor:
                     frame_id,
                     timestamp
                 )
+                if signature is not None:
+                    cache.store(signature, result)
                 results.append(result)
             except Exception as e:
                 logging.error(f"Error processing frame {frame_id} with {processor.__class__.__name__}: {e}")
         return results
 
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return result cache hit/miss counters keyed by "<step index>:<type>"."""
+        return {
+            f"{i}:{proc_config['type']}": cache.stats()
+            for i, (proc_config, cache) in enumerate(zip(self.config['pipeline']['processing'], self.caches))
+            if cache is not None
+        }
+
+    def warmup_models(self):
+        """Start loading this pipeline's models on a background thread."""
+        keys = [p.model_key for p in self.processors if p.model_key is not None]
+        return self.registry.warmup(keys)
+
+    def close(self):
+        """Release shared models so other pipelines can reuse or evict them."""
+        for processor in self.processors:
+            processor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def get_source_uri(self) -> str:
         return self.source['uri']
 
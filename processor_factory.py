@@ -1,6 +1,7 @@
-from typing import Type
+from typing import Optional, Type
 from processing_types import ProcessingType
 from base_processor import BaseProcessor
+from model_registry import ModelRegistry
 from processors import (
     ObjectDetectionProcessor,
     FaceDetectionProcessor,
@@ -21,11 +22,12 @@ class ProcessorFactory:
     }
 
     @classmethod
-    def create(cls, processing_type: ProcessingType, **kwargs) -> BaseProcessor:
+    def create(cls, processing_type: ProcessingType, registry: Optional[ModelRegistry] = None,
+               **kwargs) -> BaseProcessor:
         processor_class = cls._processors.get(processing_type)
         if not processor_class:
             raise ValueError(f"Unknown processing type: {processing_type}")
-        return processor_class(**kwargs)
+        return processor_class(registry=registry, **kwargs)
 
     @classmethod
     def register_processor(cls, processing_type: ProcessingType, processor_class: Type[BaseProcessor]):
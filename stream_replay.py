@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import time
+from typing import Iterator, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAMES_FILE = 'frames.bin'
+TIMESTAMPS_FILE = 'timestamps.bin'
+META_FILE = 'meta.json'
+
+
+class FrameRecorder:
+    """Record decoded frames and their timestamps to a directory.
+
+    Frames are appended as raw bytes to ``frames.bin`` and timestamps as
+    float64 to ``timestamps.bin``, so a recording can be memory-mapped by
+    ``ReplayCapture`` and stays readable even if recording is interrupted.
+    All frames must share the shape and dtype of the first one.
+    """
+
+    def __init__(self, path: str, overwrite: bool = False):
+        self.path = path
+        self.shape: Optional[Tuple[int, ...]] = None
+        self.dtype: Optional[np.dtype] = None
+        self.count = 0
+        frames_path = os.path.join(path, FRAMES_FILE)
+        if os.path.exists(frames_path) and not overwrite:
+            raise FileExistsError(f"Recording already exists: {path}")
+        os.makedirs(path, exist_ok=True)
+        # Stale metadata from an overwritten recording would describe the wrong frames
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        self._frames = open(frames_path, 'wb')
+        self._timestamps = open(os.path.join(path, TIMESTAMPS_FILE), 'wb')
+
+    def write(self, frame: np.ndarray, timestamp: float) -> None:
+        if self.shape is None:
+            self.shape = frame.shape
+            self.dtype = frame.dtype
+            with open(os.path.join(self.path, META_FILE), 'w') as f:
+                json.dump({'shape': list(self.shape), 'dtype': self.dtype.str}, f)
+        elif frame.shape != self.shape or frame.dtype != self.dtype:
+            raise ValueError(f"Frame {frame.shape}/{frame.dtype} does not match recording "
+                             f"{self.shape}/{self.dtype}")
+
+        self._frames.write(np.ascontiguousarray(frame).tobytes())
+        self._timestamps.write(np.float64(timestamp).tobytes())
+        self.count += 1
+
+    def close(self) -> None:
+        self._frames.close()
+        self._timestamps.close()
+        logger.info(f"Recorded {self.count} frames to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayCapture:
+    """Replay a ``FrameRecorder`` recording through the cv2.VideoCapture interface.
+
+    ``read`` never blocks; in realtime mode callers wait ``next_delay()``
+    seconds before each read to follow the recorded pacing.
+
+    Args:
+        path: Recording directory
+        realtime: Pace frames by their recorded timestamps instead of
+            returning them as fast as possible
+        loop: Restart from the first frame when the recording ends
+    """
+
+    def __init__(self, path: str, realtime: bool = False, loop: bool = False):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.position = 0
+        self.timestamp: Optional[float] = None
+        self._started_at: Optional[float] = None
+
+        meta_path = os.path.join(path, META_FILE)
+        if not os.path.exists(meta_path):
+            # Metadata is written with the first frame, so this recording is empty
+            if not os.path.isdir(path):
+                raise FileNotFoundError(f"Recording not found: {path}")
+            self.timestamps = np.empty(0, dtype=np.float64)
+            self.frames = np.empty((0,), dtype=np.uint8)
+            return
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+        shape = tuple(meta['shape'])
+        dtype = np.dtype(meta['dtype'])
+
+        timestamps = np.fromfile(os.path.join(path, TIMESTAMPS_FILE), dtype=np.float64)
+        frame_size = int(np.prod(shape)) * dtype.itemsize
+        frames_path = os.path.join(path, FRAMES_FILE)
+        # A recording cut short may end in a partial frame; ignore it
+        count = min(len(timestamps), os.path.getsize(frames_path) // frame_size)
+        self.timestamps = timestamps[:count]
+        self.frames = np.memmap(frames_path, dtype=dtype, mode='r', shape=(count,) + shape) \
+            if count else np.empty((0,) + shape, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def finished(self) -> bool:
+        return not self.loop and self.position >= len(self)
+
+    def isOpened(self) -> bool:
+        return len(self) > 0
+
+    def next_delay(self) -> float:
+        """Seconds to wait before the next ``read`` in realtime mode."""
+        if not self.realtime or self._started_at is None or self.position >= len(self):
+            return 0.0
+        offset = self.timestamps[self.position] - self.timestamps[0]
+        return max(0.0, self._started_at + offset - time.monotonic())
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.position >= len(self):
+            if not self.loop or not len(self):
+                return False, None
+            self.position = 0
+            self._started_at = None
+
+        if self._started_at is None:
+            offset = self.timestamps[self.position] - self.timestamps[0]
+            self._started_at = time.monotonic() - offset
+
+        # Copy so callers can draw on the frame without touching the mapping
+        frame = np.array(self.frames[self.position])
+        self.timestamp = float(self.timestamps[self.position])
+        self.position += 1
+        return True, frame
+
+    def release(self) -> None:
+        self.frames = np.empty((0,) + self.frames.shape[1:], dtype=self.frames.dtype)
+        self.timestamps = self.timestamps[:0]
+
+    def iter_frames(self) -> Iterator[Tuple[int, np.ndarray, float]]:
+        """Yield (frame_id, frame, timestamp) for the rest of the recording."""
+        frame_id = 0
+        while True:
+            delay = self.next_delay()
+            if delay > 0:
+                time.sleep(delay)
+            ret, frame = self.read()
+            if not ret:
+                return
+            yield frame_id, frame, self.timestamp
+            frame_id += 1
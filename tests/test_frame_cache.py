@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import numpy as np
+import pytest
+from base_processor import Detection, ProcessingResult
+from frame_cache import ResultCache, frame_signature
+from pipeline_executor import PipelineExecutor
+
+
+def make_result(frame_id=0, timestamp=0.0):
+    return ProcessingResult("custom", frame_id, timestamp, [Detection("car", 0.9, (1, 2, 3, 4))])
+
+
+def test_signature_is_block_means():
+    frame = np.zeros((4, 4), dtype=np.uint8)
+    frame[:2, :2] = 200
+    assert frame_signature(frame, grid=(2, 2)).tolist() == [200.0, 0.0, 0.0, 0.0]
+
+
+def test_signature_stable_on_large_frames():
+    rng = np.random.default_rng(0)
+    # 16x16 grid of flat blocks, upscaled to 1920x1088 with mild sensor noise
+    blocks = rng.integers(0, 256, size=(16, 16, 3)).astype(np.uint8)
+    frame = np.kron(blocks, np.ones((68, 120, 1), dtype=np.uint8))
+    expected = blocks.mean(axis=2).ravel()
+
+    signature = frame_signature(frame)
+    assert signature.dtype == np.float32
+    np.testing.assert_allclose(signature, expected, atol=1e-3)
+
+    noise = rng.integers(-3, 4, size=frame.shape)
+    noisy = np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    assert float(np.abs(frame_signature(noisy) - signature).mean()) < 1.0
+
+
+def test_signature_roi_partly_outside_is_clipped():
+    frame = np.full((10, 10, 3), 50, dtype=np.uint8)
+    frame[5:, 5:] = 250
+    signature = frame_signature(frame, grid=(1, 1), roi=(5, 5, 100, 100))
+    assert signature.tolist() == [250.0]
+
+
+@pytest.mark.parametrize("roi", [(1000, 1000, 10, 10), (0, 0, 0, 5), (-20, 0, 10, 10)])
+def test_signature_rejects_roi_outside_frame(roi):
+    with pytest.raises(ValueError):
+        frame_signature(np.zeros((10, 10, 3), dtype=np.uint8), roi=roi)
+
+
+@pytest.mark.parametrize("roi", [[0, 0, 10], [0, 0, 10, 0], [0, 0, -5, 10], [0, 0, 1.5, 10], ["0", 0, 1, 1]])
+def test_result_cache_rejects_malformed_roi(roi):
+    with pytest.raises(ValueError):
+        ResultCache(roi=roi)
+
+
+def test_hit_updates_frame_id_and_timestamp():
+    cache = ResultCache(tolerance=1.0)
+    signature = np.zeros(4, dtype=np.float32)
+    cache.store(signature, make_result(frame_id=1, timestamp=1.0))
+    result = cache.lookup(signature, frame_id=7, timestamp=7.5)
+    assert (result.frame_id, result.timestamp) == (7, 7.5)
+    assert result.detections[0].class_name == "car"
+
+
+def test_tolerance_boundary():
+    cache = ResultCache(tolerance=2.0)
+    cache.store(np.zeros(4, dtype=np.float32), make_result())
+    assert cache.lookup(np.full(4, 2.0, dtype=np.float32), 1, 1.0) is not None
+    assert cache.lookup(np.full(4, 2.5, dtype=np.float32), 2, 2.0) is None
+
+
+def test_hit_rate_counting():
+    cache = ResultCache(tolerance=0.0)
+    signature = np.zeros(4, dtype=np.float32)
+    assert cache.lookup(signature, 0, 0.0) is None
+    cache.store(signature, make_result())
+    cache.lookup(signature, 1, 1.0)
+    cache.lookup(signature, 2, 2.0)
+    cache.lookup(np.ones(4, dtype=np.float32), 3, 3.0)
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'hit_rate': 0.5, 'size': 1}
+
+
+def test_lru_bound_evicts_least_recently_used():
+    cache = ResultCache(tolerance=0.0, max_size=2)
+    a, b, c = (np.full(4, v, dtype=np.float32) for v in (0, 100, 200))
+    cache.store(a, make_result())
+    cache.store(b, make_result())
+    cache.lookup(a, 1, 1.0)  # a becomes most recently used
+    cache.store(c, make_result())
+    assert cache.stats()['size'] == 2
+    assert cache.lookup(a, 2, 2.0) is not None
+    assert cache.lookup(b, 3, 3.0) is None
+
+
+def test_reused_results_do_not_share_detections():
+    cache = ResultCache(tolerance=0.0)
+    signature = np.zeros(4, dtype=np.float32)
+    original = make_result()
+    cache.store(signature, original)
+    original.detections.append(Detection("person", 0.5, (0, 0, 1, 1)))
+    first = cache.lookup(signature, 1, 1.0)
+    first.detections[0].class_name = "truck"
+    second = cache.lookup(signature, 2, 2.0)
+    assert [d.class_name for d in second.detections] == ["car"]
+
+
+def make_executor(steps):
+    config = {'pipeline': {
+        'name': 'test', 'source': {'uri': 'rtsp://camera.local/stream'}, 'output': [],
+        'processing': steps,
+    }}
+    executor = PipelineExecutor(config)
+    calls = []
+    for processor in executor.processors:
+        original = processor.process
+
+        def counting(frame, frame_id, timestamp, original=original):
+            calls.append(frame_id)
+            return original(frame, frame_id, timestamp)
+        processor.process = counting
+    return executor, calls
+
+
+def test_process_frame_skips_processor_on_hit():
+    executor, calls = make_executor([{'type': 'custom', 'cache': {'tolerance': 1.0}}])
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+
+    async def run():
+        results = [await executor.process_frame(frame, i, float(i)) for i in range(3)]
+        changed = frame.copy()
+        changed[:16] = 255
+        results.append(await executor.process_frame(changed, 3, 3.0))
+        return results
+
+    results = asyncio.run(run())
+    assert calls == [0, 3]
+    assert [r[0].frame_id for r in results] == [0, 1, 2, 3]
+    assert executor.cache_stats() == {'0:custom': {'hits': 2, 'misses': 2, 'hit_rate': 0.5, 'size': 2}}
+
+
+def test_process_frame_bypasses_cache_for_roi_outside_frame(caplog):
+    executor, calls = make_executor([{'type': 'custom', 'cache': {'roi': [1000, 1000, 10, 10]}}])
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+
+    async def run():
+        for i in range(3):
+            await executor.process_frame(frame, i, float(i))
+
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(run())
+    assert calls == [0, 1, 2]
+    assert caplog.text.count("Bypassing result cache") == 1
+
+
+def test_malformed_roi_rejected_at_load():
+    with pytest.raises(ValueError):
+        make_executor([{'type': 'custom', 'cache': {'roi': [0, 0, 10]}}])
+
+
+@pytest.mark.parametrize("cache_config,enabled", [({}, True), (True, True), (False, False), (None, False)])
+def test_cache_config_enables_cache(cache_config, enabled):
+    executor, _ = make_executor([{'type': 'custom', 'cache': cache_config}])
+    assert (executor.caches[0] is not None) == enabled
+
+
+def test_cache_stats_keyed_per_step():
+    executor, _ = make_executor([{'type': 'custom', 'cache': True}, {'type': 'custom', 'cache': True}])
+    assert set(executor.cache_stats()) == {'0:custom', '1:custom'}
@@ -0,0 +1,198 @@
+import logging
+import threading
+import pytest
+from base_processor import BaseProcessor, ProcessingResult
+from model_registry import ModelRegistry
+from processing_types import ProcessingType
+from processor_factory import ProcessorFactory
+
+
+class DummyProcessor(BaseProcessor):
+    loads = []
+
+    @classmethod
+    def load_model(cls, model_path, **params):
+        cls.loads.append((model_path, params))
+        return {'path': model_path, 'params': params}
+
+    def process(self, frame, frame_id, timestamp):
+        return ProcessingResult("custom", frame_id, timestamp, [])
+
+
+class OtherDummyProcessor(DummyProcessor):
+    @classmethod
+    def load_model(cls, model_path, **params):
+        return 'other'
+
+
+class FailingProcessor(DummyProcessor):
+    @classmethod
+    def load_model(cls, model_path, **params):
+        raise RuntimeError("corrupt weights")
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    monkeypatch.setattr(ProcessorFactory, '_processors', dict(ProcessorFactory._processors))
+    DummyProcessor.loads = []
+
+    def create(processor_class, registry, model_path='/models/dummy.pt', **params):
+        ProcessorFactory.register_processor(ProcessingType.CUSTOM, processor_class)
+        return ProcessorFactory.create(ProcessingType.CUSTOM, registry=registry,
+                                       model_path=model_path, **params)
+    return create
+
+
+def sized_registry(budget=None):
+    # Every dummy model counts as 100 bytes
+    return ModelRegistry(memory_budget=budget, size_estimator=lambda model, path: 100)
+
+
+def test_nothing_loads_at_construction(factory):
+    registry = sized_registry()
+    processor = factory(DummyProcessor, registry)
+    assert DummyProcessor.loads == []
+    assert not registry.is_loaded(processor.model_key)
+
+
+def test_same_path_and_params_load_once(factory):
+    registry = sized_registry()
+    first = factory(DummyProcessor, registry, classes=[0, 1])
+    second = factory(DummyProcessor, registry, classes=[0, 1])
+    assert first.model_key == second.model_key
+    assert registry.refcount(first.model_key) == 2
+    assert first.model is second.model
+    assert DummyProcessor.loads == [('/models/dummy.pt', {'classes': [0, 1]})]
+
+
+def test_different_params_load_separately(factory):
+    registry = sized_registry()
+    first = factory(DummyProcessor, registry, classes=[0])
+    second = factory(DummyProcessor, registry, classes=[1])
+    assert first.model is not second.model
+    assert len(DummyProcessor.loads) == 2
+
+
+def test_different_loaders_do_not_share(factory):
+    registry = sized_registry()
+    first = factory(DummyProcessor, registry)
+    second = factory(OtherDummyProcessor, registry)
+    assert first.model_key != second.model_key
+    assert first.model['path'] == '/models/dummy.pt'
+    assert second.model == 'other'
+
+
+def test_released_model_is_evicted_under_budget(factory):
+    registry = sized_registry(budget=150)
+    first = factory(DummyProcessor, registry, model_path='/models/a.pt')
+    first.model
+    first_key = first.model_key
+    first.close()
+    # Idle but still within budget, so it stays loaded for reuse
+    assert registry.refcount(first_key) == 0
+    assert registry.is_loaded(first_key)
+
+    second = factory(DummyProcessor, registry, model_path='/models/b.pt')
+    second.model
+    assert registry.loaded_keys() == [second.model_key]
+    assert registry.loaded_size == 100
+
+
+def test_idle_models_evicted_least_recently_used_first(factory):
+    registry = sized_registry(budget=250)
+    a, b = (factory(DummyProcessor, registry, model_path=p) for p in ('/models/a.pt', '/models/b.pt'))
+    a.model
+    b.model
+    a.model  # a is now more recently used than b
+    a_key, b_key = a.model_key, b.model_key
+    a.close()
+    b.close()
+
+    c = factory(DummyProcessor, registry, model_path='/models/c.pt')
+    c.model
+    assert registry.is_loaded(a_key)
+    assert not registry.is_loaded(b_key)
+
+
+def test_referenced_models_are_never_evicted(factory, caplog):
+    registry = sized_registry(budget=150)
+    a = factory(DummyProcessor, registry, model_path='/models/a.pt')
+    b = factory(DummyProcessor, registry, model_path='/models/b.pt')
+    with caplog.at_level(logging.WARNING):
+        a.model
+        b.model
+    assert registry.is_loaded(a.model_key) and registry.is_loaded(b.model_key)
+    assert "above budget" in caplog.text
+
+
+def test_warmup_loads_on_background_thread(factory):
+    registry = sized_registry()
+    processor = factory(DummyProcessor, registry)
+    thread = registry.warmup([processor.model_key])
+    thread.join(timeout=5)
+    assert thread.name == "model-warmup"
+    assert registry.is_loaded(processor.model_key)
+    assert len(DummyProcessor.loads) == 1
+
+
+def test_warmup_logs_loader_errors(factory, caplog):
+    registry = sized_registry()
+    processor = factory(FailingProcessor, registry)
+    with caplog.at_level(logging.ERROR):
+        registry.warmup([processor.model_key]).join(timeout=5)
+    assert "corrupt weights" in caplog.text
+    assert not registry.is_loaded(processor.model_key)
+
+
+def test_pipeline_executor_releases_models_on_exit():
+    from pipeline_executor import PipelineExecutor
+    registry = sized_registry()
+    config = {'pipeline': {
+        'name': 'test', 'source': {'uri': 'rtsp://camera.local/stream'}, 'output': [],
+        'processing': [{'type': 'object_detection', 'model_path': '/models/yolov5s.pt'}],
+    }}
+    with PipelineExecutor(config, registry=registry) as executor:
+        key = executor.processors[0].model_key
+        assert registry.refcount(key) == 1
+    assert registry.refcount(key) == 0
+
+
+def test_pipeline_executor_releases_models_when_a_step_fails():
+    from pipeline_executor import PipelineExecutor
+    registry = sized_registry()
+    config = {'pipeline': {
+        'name': 'test', 'source': {'uri': 'rtsp://camera.local/stream'}, 'output': [],
+        'processing': [
+            {'type': 'object_detection', 'model_path': '/models/yolov5s.pt'},
+            {'type': 'not_a_processor', 'model_path': '/models/other.pt'},
+        ],
+    }}
+    with pytest.raises(ValueError):
+        PipelineExecutor(config, registry=registry)
+    assert registry._entries == {}
+
+
+def test_release_during_load_does_not_cache_orphaned_model():
+    registry = sized_registry()
+    loading = threading.Event()
+    finish = threading.Event()
+
+    def slow_loader(model_path):
+        loading.set()
+        finish.wait(timeout=5)
+        return 'model'
+
+    key = registry.acquire('/models/slow.pt', slow_loader)
+    entry = registry._entries[key]
+    results = []
+    thread = threading.Thread(target=lambda: results.append(registry.get(key)))
+    thread.start()
+    assert loading.wait(timeout=5)
+    registry.release(key)
+    finish.set()
+    thread.join(timeout=5)
+
+    assert results == ['model']
+    assert not entry.loaded
+    assert registry.loaded_keys() == []
+    assert registry.refcount(key) == 0
@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from stream_replay import FRAMES_FILE, FrameRecorder, ReplayCapture
+
+
+def record(path, count=5, shape=(4, 6, 3), dtype=np.uint8, interval=0.05):
+    frames = [np.full(shape, i, dtype=dtype) for i in range(count)]
+    timestamps = [100.0 + i * interval for i in range(count)]
+    with FrameRecorder(str(path)) as recorder:
+        for frame, timestamp in zip(frames, timestamps):
+            recorder.write(frame, timestamp)
+    return frames, timestamps
+
+
+@pytest.mark.parametrize("shape,dtype", [((4, 6, 3), np.uint8), ((5, 7), np.float32)])
+def test_round_trip_preserves_frames_and_timestamps(tmp_path, shape, dtype):
+    frames, timestamps = record(tmp_path, shape=shape, dtype=dtype)
+    replayed = list(ReplayCapture(str(tmp_path)).iter_frames())
+    assert [frame_id for frame_id, _, _ in replayed] == list(range(len(frames)))
+    assert [t for _, _, t in replayed] == timestamps
+    for original, (_, frame, _) in zip(frames, replayed):
+        assert frame.shape == shape and frame.dtype == dtype
+        np.testing.assert_array_equal(frame, original)
+
+
+def test_truncated_trailing_frame_is_ignored(tmp_path):
+    record(tmp_path, count=3)
+    with open(tmp_path / FRAMES_FILE, 'ab') as f:
+        f.write(b'\x01' * 10)
+    assert len(ReplayCapture(str(tmp_path))) == 3
+
+
+def test_recorder_rejects_mismatched_frames(tmp_path):
+    with FrameRecorder(str(tmp_path)) as recorder:
+        recorder.write(np.zeros((4, 4, 3), dtype=np.uint8), 0.0)
+        with pytest.raises(ValueError):
+            recorder.write(np.zeros((8, 8, 3), dtype=np.uint8), 1.0)
+
+
+def test_recorder_refuses_to_overwrite(tmp_path):
+    record(tmp_path)
+    with pytest.raises(FileExistsError):
+        FrameRecorder(str(tmp_path))
+    FrameRecorder(str(tmp_path), overwrite=True).close()
+    assert not ReplayCapture(str(tmp_path)).isOpened()
+
+
+def test_empty_recording_is_not_opened(tmp_path):
+    FrameRecorder(str(tmp_path)).close()
+    capture = ReplayCapture(str(tmp_path))
+    assert not capture.isOpened()
+    assert capture.read() == (False, None)
+
+
+def test_missing_recording_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ReplayCapture(str(tmp_path / "missing"))
+
+
+def test_finished_without_loop(tmp_path):
+    record(tmp_path, count=2)
+    capture = ReplayCapture(str(tmp_path))
+    assert not capture.finished
+    capture.read()
+    capture.read()
+    assert capture.finished
+    assert capture.read() == (False, None)
+
+
+def test_loop_restarts_from_first_frame(tmp_path):
+    record(tmp_path, count=3)
+    capture = ReplayCapture(str(tmp_path), loop=True)
+    values = [int(capture.read()[1][0, 0, 0]) for _ in range(7)]
+    assert values == [0, 1, 2, 0, 1, 2, 0]
+    assert not capture.finished
+
+
+def test_realtime_pacing_follows_recorded_offsets(tmp_path):
+    record(tmp_path, count=5, interval=0.05)
+    capture = ReplayCapture(str(tmp_path), realtime=True)
+    start = time.monotonic()
+    arrivals = [time.monotonic() - start for _ in capture.iter_frames()]
+    for expected, actual in zip([0.0, 0.05, 0.1, 0.15, 0.2], arrivals):
+        assert actual == pytest.approx(expected, abs=0.03)
+
+
+def test_read_does_not_block_in_realtime(tmp_path):
+    record(tmp_path, count=2, interval=5.0)
+    capture = ReplayCapture(str(tmp_path), realtime=True)
+    capture.read()
+    start = time.monotonic()
+    assert capture.next_delay() == pytest.approx(5.0, abs=0.1)
+    capture.read()
+    assert time.monotonic() - start < 1.0
+
+
+class FakeRSSFeedService:
+    def __init__(self, output_config):
+        self.events = []
+
+    async def start(self):
+        pass
+
+    def save_frame(self, frame, timestamp):
+        return None
+
+    def add_event(self, event):
+        self.events.append(event)
+
+
+class FakeCapture:
+    """Stands in for cv2.VideoCapture on a live stream."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if not self.frames:
+            return False, None
+        return True, self.frames.pop(0)
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def executor_module(monkeypatch):
+    pytest.importorskip("cv2")
+    pytest.importorskip("aiohttp")
+    pytest.importorskip("feedgen")
+    import executor
+    monkeypatch.setattr(executor, 'RSSFeedService', FakeRSSFeedService)
+    return executor
+
+
+def make_pipeline():
+    return SimpleNamespace(
+        source=SimpleNamespace(uri='rtsp://camera.local/stream', credentials=None),
+        output=SimpleNamespace(uri='http://localhost:8080/feed', params={}),
+    )
+
+
+async def collect(stream_executor, limit=None):
+    stream_executor.running = True
+    results = []
+    stream = stream_executor._process_stream()
+    try:
+        async for result in stream:
+            results.append(result)
+            if limit is not None and len(results) == limit:
+                break
+    finally:
+        await stream.aclose()
+    return results
+
+
+def live_frames(shapes):
+    return [np.full(shape, i, dtype=np.uint8) for i, shape in enumerate(shapes)]
+
+
+def test_executor_rejects_recording_into_replayed_directory(executor_module, tmp_path):
+    record(tmp_path)
+    with pytest.raises(ValueError):
+        executor_module.Executor(make_pipeline(), record_path=str(tmp_path), replay_path=str(tmp_path))
+
+
+def test_executor_realtime_replay_does_not_block_event_loop(executor_module, tmp_path):
+    record(tmp_path, count=3, interval=0.2)
+    replay = executor_module.Executor(make_pipeline(), replay_path=str(tmp_path), replay_realtime=True)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        start = time.monotonic()
+        results = await collect(replay)
+        elapsed = time.monotonic() - start
+        task.cancel()
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(run())
+    # The stream ends with the recording, paced by its 0.2 s gaps
+    assert len(results) == 3
+    assert elapsed == pytest.approx(0.4, abs=0.15)
+    assert ticks >= 20
+
+
+def test_executor_record_then_replay_keeps_timestamps(executor_module, monkeypatch, tmp_path):
+    path = str(tmp_path / "recording")
+    monkeypatch.setattr(executor_module.cv2, 'VideoCapture',
+                        lambda url: FakeCapture(live_frames([(8, 8, 3)] * 3)))
+    recorded = asyncio.run(collect(executor_module.Executor(make_pipeline(), record_path=path), limit=3))
+
+    replayed = asyncio.run(collect(executor_module.Executor(make_pipeline(), replay_path=path)))
+    assert [r['timestamp'] for r in replayed] == [r['timestamp'] for r in recorded]
+    assert [r['frame_size'] for r in replayed] == [(8, 8, 3)] * 3
+
+
+def test_executor_stops_recording_on_size_change(executor_module, monkeypatch, tmp_path, caplog):
+    path = str(tmp_path / "recording")
+    shapes = [(8, 8, 3), (8, 8, 3), (16, 16, 3), (16, 16, 3)]
+    monkeypatch.setattr(executor_module.cv2, 'VideoCapture', lambda url: FakeCapture(live_frames(shapes)))
+
+    with caplog.at_level(logging.ERROR):
+        results = asyncio.run(collect(executor_module.Executor(make_pipeline(), record_path=path), limit=4))
+
+    assert [r['frame_size'] for r in results] == shapes
+    assert "Stopping recording" in caplog.text
+    assert len(ReplayCapture(path)) == 2